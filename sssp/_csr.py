@@ -0,0 +1,53 @@
+"""Compressed sparse row (CSR) construction from a node mapping."""
+
+from __future__ import annotations
+
+from array import array
+from operator import itemgetter
+from typing import Dict, Hashable, Iterable, Tuple
+
+GraphMapping = Dict[Hashable, Iterable[Tuple[Hashable, float]]]
+
+# Integers below this bound are exact in float32.
+FLOAT32_EXACT = 2**24
+
+
+def _csr_from_mapping(
+    graph: GraphMapping, source: Hashable
+) -> Tuple[Dict[Hashable, int], array, array, array, float]:
+    """Return ``(index, indptr, head, weight, max_weight)`` for ``graph``."""
+
+    index: Dict[Hashable, int] = {u: i for i, u in enumerate(graph)}
+    indptr = array("q", [0])
+    head = array("i")
+    # Fill as float32 and widen once if a weight rules it out.
+    weight = array("f")
+    exact32 = True
+    max_weight = 0.0
+    for nbrs in graph.values():
+        row = sorted(nbrs, key=itemgetter(1))
+        if row:
+            if row[0][1] < 0:
+                raise ValueError("Negative edge weights are not supported")
+            if row[-1][1] > max_weight:
+                max_weight = float(row[-1][1])
+                if exact32 and max_weight >= FLOAT32_EXACT:
+                    exact32 = False
+                    weight = array("d", weight)
+        for v, w in row:
+            j = index.get(v)
+            if j is None:
+                j = index[v] = len(index)
+            head.append(j)
+            if exact32 and w % 1:
+                exact32 = False
+                weight = array("d", weight)
+            weight.append(w)
+        indptr.append(len(head))
+    if source not in index:
+        index[source] = len(index)
+    n = len(index)
+    indptr.extend([len(head)] * (n + 1 - len(indptr)))
+    if exact32 and max_weight * n >= FLOAT32_EXACT:
+        weight = array("d", weight)
+    return index, indptr, head, weight, max_weight
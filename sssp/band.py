@@ -18,15 +18,32 @@ non-negative weights.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Hashable, Iterable, List, Tuple
+from array import array
+from itertools import count
+from operator import itemgetter
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    MutableSequence,
+    Tuple,
+)
 import heapq
 import math
 
+from ._csr import FLOAT32_EXACT, GraphMapping, _csr_from_mapping
+
 Weight = float
-GraphMapping = Dict[Hashable, Iterable[Tuple[Hashable, Weight]]]
 
 INF = float("inf")
 
+# Pivot sets larger than this fraction of the vertices, and at least
+# BATCH_PIVOT_MIN strong, are relaxed in unordered rounds rather than
+# through a priority queue.
+BATCH_PIVOT_FRACTION = 0.05
+BATCH_PIVOT_MIN = 64
+
 
 @dataclass(frozen=True)
 class Edge:
@@ -36,47 +53,129 @@ class Edge:
 
 
 class Graph:
-    """Simple adjacency-list graph used internally by the algorithm."""
+    """CSR graph, rows in ascending weight order, used by the algorithm."""
 
     def __init__(self, n: int, edges: Iterable[Tuple[int, int, float]]):
-        self.n = n
-        self.adj: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        edges = sorted(edges, key=itemgetter(2))
+        if edges and edges[0][2] < 0:
+            raise ValueError("Negative edge weights are not supported")
+
+        indptr = array("q", [0]) * (n + 1)
+        integral = True
+        for u, _, w in edges:
+            indptr[u + 1] += 1
+            if integral and w % 1:
+                integral = False
+        for u in range(n):
+            indptr[u + 1] += indptr[u]
+
+        m = indptr[n]
+        max_weight = float(edges[-1][2]) if m else 0.0
+        exact32 = integral and max_weight * n < FLOAT32_EXACT
+        head = array("i", [0]) * m
+        weight = array("f" if exact32 else "d", [0.0]) * m
+        cursor = indptr[:-1]
         for u, v, w in edges:
-            if w < 0:
-                raise ValueError("Negative edge weights are not supported")
-            self.adj[u].append((v, float(w)))
+            i = cursor[u]
+            head[i] = v
+            weight[i] = w
+            cursor[u] = i + 1
+
+        self._set_csr(n, indptr, head, weight, max_weight)
+
+    @classmethod
+    def from_csr(
+        cls,
+        n: int,
+        indptr: array,
+        head: array,
+        weight: array,
+        max_weight: float | None = None,
+    ) -> "Graph":
+        """Wrap prebuilt CSR arrays whose rows are already in weight order."""
+
+        G = cls.__new__(cls)
+        if max_weight is None:
+            max_weight = float(max(weight)) if len(weight) else 0.0
+        G._set_csr(n, indptr, head, weight, max_weight)
+        return G
+
+    def _set_csr(
+        self, n: int, indptr: array, head: array, weight: array, max_weight: float
+    ) -> None:
+        self.n = n
+        self.m = len(head)
+        self.indptr = indptr
+        self.head = head
+        self.weight = weight
+        self.max_weight = max_weight
+        self.typecode = weight.typecode
 
 
-def relax(u: int, v: int, w: float, dist: List[float]) -> bool:
-    du = dist[u]
-    if du + w < dist[v]:
-        dist[v] = du + w
-        return True
-    return False
+def relax_rounds(
+    G: Graph,
+    dist: MutableSequence[float],
+    work: List[int],
+    rounds: int | None,
+    band_upper: float,
+    in_work: bytearray,
+    frontier: bytearray,
+    last_du: array,
+) -> None:
+    """Relax ``work`` for ``rounds`` rounds, or to a fixed point if ``None``."""
+
+    indptr = G.indptr
+    head = G.head
+    weight = G.weight
+
+    for _ in count() if rounds is None else range(rounds):
+        next_work: List[int] = []
+        for u in work:
+            du = dist[u]
+            if du >= band_upper or du == last_du[u]:
+                continue
+            last_du[u] = du
+            for i in range(indptr[u], indptr[u + 1]):
+                nd = du + weight[i]
+                if nd >= band_upper:
+                    break
+                v = head[i]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    frontier[v] = 1
+                    if not in_work[v]:
+                        in_work[v] = 1
+                        next_work.append(v)
+        for v in next_work:
+            in_work[v] = 0
+        work = next_work
+        if not work:
+            break
 
 
 def k_round_relax(
     G: Graph,
-    dist: List[float],
+    dist: MutableSequence[float],
     active: List[int],
     k: int,
     band_upper: float,
+    in_work: bytearray | None = None,
+    frontier: bytearray | None = None,
+    last_du: array | None = None,
 ) -> Tuple[List[int], List[int]]:
     """Perform ``k`` rounds of restricted relaxations within ``band_upper``."""
 
-    work = set(active)
-    for _ in range(k):
-        next_work = set()
-        for u in list(work):
-            du = dist[u]
-            if du >= band_upper:
-                continue
-            for v, w in G.adj[u]:
-                if du + w < band_upper and relax(u, v, w, dist):
-                    next_work.add(v)
-        work = next_work
-        if not work:
-            break
+    indptr = G.indptr
+    head = G.head
+    weight = G.weight
+    if in_work is None:
+        in_work = bytearray(G.n)
+    if frontier is None:
+        frontier = bytearray(G.n)
+    if last_du is None:
+        last_du = array(G.typecode, [INF]) * G.n
+
+    relax_rounds(G, dist, active, k, band_upper, in_work, frontier, last_du)
 
     settled: List[int] = []
     incomplete: List[int] = []
@@ -84,12 +183,19 @@ def k_round_relax(
         du = dist[u]
         if du >= band_upper:
             continue
+        if du == last_du[u]:
+            settled.append(u)
+            continue
         can_improve = False
-        for v, w in G.adj[u]:
-            if du + w < dist[v] and du + w < band_upper:
+        for i in range(indptr[u], indptr[u + 1]):
+            nd = du + weight[i]
+            if nd >= band_upper:
+                break
+            if nd < dist[head[i]]:
                 can_improve = True
                 break
         if can_improve:
+            frontier[u] = 1
             incomplete.append(u)
         else:
             settled.append(u)
@@ -99,46 +205,77 @@ def k_round_relax(
 
 def select_pivots(
     G: Graph,
-    dist: List[float],
+    dist: MutableSequence[float],
     candidates: List[int],
     band_upper: float,
     budget_k: int,
 ) -> List[int]:
     """Select a small set of pivot vertices among ``candidates``."""
 
+    indptr = G.indptr
+    weight = G.weight
+
     scored: List[Tuple[int, int]] = []
     for u in candidates:
         du = dist[u]
         if du >= band_upper:
             continue
         score = 0
-        for v, w in G.adj[u]:
-            if du + w < band_upper:
-                score += 1
+        for i in range(indptr[u], indptr[u + 1]):
+            if du + weight[i] >= band_upper:
+                break
+            score += 1
         scored.append((score, u))
 
-    scored.sort(reverse=True)
     target = max(1, len(candidates) // max(1, budget_k))
-    return [u for _, u in scored[:target]]
+    return [u for _, u in heapq.nlargest(target, scored)]
 
 
-def process_pivots(G: Graph, dist: List[float], pivots: List[int], band_upper: float) -> None:
+def process_pivots(
+    G: Graph,
+    dist: MutableSequence[float],
+    pivots: List[int],
+    band_upper: float,
+    in_work: bytearray | None = None,
+    frontier: bytearray | None = None,
+    last_du: array | None = None,
+) -> None:
     """Process pivot vertices using a small heap."""
 
-    H: List[Tuple[float, int]] = []
-    seen = set()
-    for u in pivots:
-        if dist[u] < band_upper and u not in seen:
-            heapq.heappush(H, (dist[u], u))
-            seen.add(u)
+    indptr = G.indptr
+    head = G.head
+    weight = G.weight
+    if frontier is None:
+        frontier = bytearray(G.n)
+    if last_du is None:
+        last_du = array(G.typecode, [INF]) * G.n
+
+    if len(pivots) >= BATCH_PIVOT_MIN and len(pivots) > BATCH_PIVOT_FRACTION * G.n:
+        if in_work is None:
+            in_work = bytearray(G.n)
+        relax_rounds(G, dist, pivots, None, band_upper, in_work, frontier, last_du)
+        return
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    H = [(dist[u], u) for u in set(pivots) if dist[u] < band_upper]
+    heapq.heapify(H)
 
     while H:
-        du, u = heapq.heappop(H)
-        if du != dist[u] or du >= band_upper:
+        du, u = heappop(H)
+        if du != dist[u] or du >= band_upper or du == last_du[u]:
             continue
-        for v, w in G.adj[u]:
-            if du + w < band_upper and relax(u, v, w, dist):
-                heapq.heappush(H, (dist[v], v))
+        last_du[u] = du
+        for i in range(indptr[u], indptr[u + 1]):
+            nd = du + weight[i]
+            if nd >= band_upper:
+                break
+            v = head[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                frontier[v] = 1
+                heappush(H, (nd, v))
 
 
 def band_partitioned_sssp(
@@ -148,53 +285,73 @@ def band_partitioned_sssp(
     initial_band: float | None = None,
     k: int | None = None,
     growth: float = 2.0,
-) -> List[float]:
+) -> array:
     """Compute shortest paths from ``s`` using banding and pivot reduction."""
 
     n = G.n
-    dist = [INF] * n
+    indptr = G.indptr
+    head = G.head
+    weight = G.weight
+    dist = array(G.typecode, [INF]) * n
     dist[s] = 0.0
 
     if k is None:
         k = max(1, int(round(math.log2(max(2, n)) ** (1 / 3))))
 
     if initial_band is None:
-        total_w = 0.0
-        cnt = 0
-        for u in range(n):
-            for _, w in G.adj[u]:
-                total_w += w
-                cnt += 1
-        avg_w = (total_w / max(1, cnt)) if cnt else 1.0
+        avg_w = (sum(weight) / G.m) if G.m else 1.0
+        if avg_w <= 0.0:
+            avg_w = 1.0  # All-zero weights would pin the band at zero.
         initial_band = avg_w * max(2.0, math.log2(max(2, n)))
+    max_w = G.max_weight
 
     band_upper = initial_band
     active = [s]
+    in_work = bytearray(n)
+    # Only vertices flagged here can have gained an improving in-band edge
+    # since ``active`` was computed, so they make up the next ``active``.
+    frontier = bytearray(n)
+    # Scans are only repeatable within one band; growing the band resets it.
+    last_du = array(G.typecode, [INF]) * n
 
     while True:
-        settled, incomplete = k_round_relax(G, dist, active, k, band_upper)
+        settled, incomplete = k_round_relax(
+            G, dist, active, k, band_upper, in_work, frontier, last_du
+        )
 
         if incomplete:
             pivots = select_pivots(G, dist, incomplete, band_upper, budget_k=k)
-            process_pivots(G, dist, pivots, band_upper)
+            process_pivots(G, dist, pivots, band_upper, in_work, frontier, last_du)
 
+        # k_round_relax's first round tests the edges of every vertex in
+        # ``active``, so candidates are passed on without a rescan here.
+        # A flagged vertex still at ``last_du`` has nothing left to relax.
         next_active: List[int] = []
-        for u in range(n):
-            if dist[u] < band_upper:
-                for v, w in G.adj[u]:
-                    if dist[u] + w < band_upper and dist[u] + w < dist[v] + 1e-18:
-                        next_active.append(u)
-                        break
+        u = frontier.find(1)
+        while u >= 0:
+            frontier[u] = 0
+            du = dist[u]
+            if du < band_upper and du != last_du[u]:
+                next_active.append(u)
+            u = frontier.find(1, u + 1)
 
         if not next_active:
+            # Once the band covers every edge leaving a reached vertex, no
+            # edge can improve a distance and further bands are no-ops.
+            reach = max(d for d in dist if d < INF)
+            if reach + max_w < band_upper:
+                break
             band_upper *= growth
+            last_du = array(G.typecode, [INF]) * n
             seed = set()
             for u in range(n):
-                if dist[u] < band_upper:
+                du = dist[u]
+                if du < band_upper:
                     seed.add(u)
-                    for v, w in G.adj[u]:
-                        if dist[u] + w < band_upper:
-                            seed.add(v)
+                    for i in range(indptr[u], indptr[u + 1]):
+                        if du + weight[i] >= band_upper:
+                            break
+                        seed.add(head[i])
             active = list(seed)
         else:
             active = next_active
@@ -202,17 +359,28 @@ def band_partitioned_sssp(
         if band_upper > 1e18:
             break
 
+    # Finish with Dijkstra seeded only by vertices that still have an
+    # improving out-edge; every other vertex is already at a fixed point.
     H: List[Tuple[float, int]] = []
-    for u in range(n):
-        if dist[u] < INF:
-            heapq.heappush(H, (dist[u], u))
+    for u, du in enumerate(dist):
+        if du < INF:
+            for i in range(indptr[u], indptr[u + 1]):
+                if du + weight[i] < dist[head[i]]:
+                    H.append((du, u))
+                    break
+    heapq.heapify(H)
+    heappush = heapq.heappush
+    heappop = heapq.heappop
     while H:
-        du, u = heapq.heappop(H)
+        du, u = heappop(H)
         if du != dist[u]:
             continue
-        for v, w in G.adj[u]:
-            if relax(u, v, w, dist):
-                heapq.heappush(H, (dist[v], v))
+        for i in range(indptr[u], indptr[u + 1]):
+            nd = du + weight[i]
+            v = head[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                heappush(H, (nd, v))
 
     return dist
 
@@ -220,25 +388,9 @@ def band_partitioned_sssp(
 def band_sssp(graph: GraphMapping, source: Hashable) -> Dict[Hashable, Weight]:
     """Public wrapper mirroring :func:`dijkstra`'s interface."""
 
-    nodes = set(graph.keys())
-    for nbrs in graph.values():
-        for v, _ in nbrs:
-            nodes.add(v)
-    if source not in nodes:
-        nodes.add(source)
-
-    node_list = list(nodes)
-    index = {node: i for i, node in enumerate(node_list)}
-
-    edges: List[Tuple[int, int, float]] = []
-    for u, nbrs in graph.items():
-        for v, w in nbrs:
-            if w < 0:
-                raise ValueError("Negative edge weights are not supported")
-            edges.append((index[u], index[v], float(w)))
-
-    G = Graph(len(node_list), edges)
-    dist_list = band_partitioned_sssp(G, index[source])
+    index, indptr, head, weight, max_weight = _csr_from_mapping(graph, source)
+    G = Graph.from_csr(len(index), indptr, head, weight, max_weight)
+    dist_list = band_partitioned_sssp(G, index[source]).tolist()
 
     result: Dict[Hashable, Weight] = {}
     for node, i in index.items():
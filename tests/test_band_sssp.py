@@ -5,6 +5,26 @@ import networkx as nx
 import pytest
 
 from sssp import band_sssp, dijkstra
+from sssp import band
+from sssp.band import INF, Graph, band_partitioned_sssp, process_pivots
+
+
+def _fractional_graph(n, seed):
+    rng = random.Random(seed)
+    edges = [(u, u + 1, rng.uniform(0, 10)) for u in range(n - 1)]
+    edges += [
+        (rng.randrange(n), rng.randrange(n), rng.uniform(0, 10)) for _ in range(3 * n)
+    ]
+    mapping = defaultdict(list)
+    for u, v, w in edges:
+        mapping[u].append((v, w))
+    return Graph(n, edges), mapping
+
+
+def _assert_matches_dijkstra(dist, mapping, n):
+    expected = dijkstra(mapping, 0)
+    for u in range(n):
+        assert dist[u] == pytest.approx(expected.get(u, INF))
 
 
 @pytest.mark.parametrize("algo", [dijkstra, band_sssp])
@@ -75,3 +95,136 @@ def test_grid_random_weights(algo):
             nx_graph.add_edge(u, v, weight=w)
     expected = nx.single_source_dijkstra_path_length(nx_graph, (0, 0), weight="weight")
     assert algo(graph, (0, 0)) == expected
+
+
+@pytest.mark.parametrize("algo", [dijkstra, band_sssp])
+def test_zero_weight_chain_from_source(algo):
+    graph = {"A": [("B", 0)], "B": [("C", 0), ("D", 2)], "C": [("D", 0)], "D": []}
+    assert algo(graph, "A") == {"A": 0.0, "B": 0.0, "C": 0.0, "D": 0.0}
+
+
+@pytest.mark.parametrize("algo", [dijkstra, band_sssp])
+def test_all_zero_weights(algo):
+    graph = {"A": [("B", 0)], "B": [("C", 0)], "C": []}
+    assert algo(graph, "A") == {"A": 0.0, "B": 0.0, "C": 0.0}
+
+
+@pytest.mark.parametrize("algo", [dijkstra, band_sssp])
+def test_fractional_weights(algo):
+    random.seed(5)
+    n = 30
+    g = nx.gnp_random_graph(n, 0.2, directed=True, seed=5)
+    graph = defaultdict(list)
+    nx_graph = nx.DiGraph()
+    for u, v in g.edges():
+        w = random.uniform(0, 10)
+        graph[u].append((v, w))
+        nx_graph.add_edge(u, v, weight=w)
+    expected = nx.single_source_dijkstra_path_length(nx_graph, 0, weight="weight")
+    result = algo(graph, 0)
+    assert result.keys() == expected.keys()
+    for node, d in expected.items():
+        assert result[node] == pytest.approx(d)
+
+
+@pytest.mark.parametrize("algo", [dijkstra, band_sssp])
+def test_large_integer_weights(algo):
+    random.seed(11)
+    n = 40
+    g = nx.gnp_random_graph(n, 0.2, directed=True, seed=11)
+    graph = defaultdict(list)
+    nx_graph = nx.DiGraph()
+    for u, v in g.edges():
+        w = random.randint(0, 10**6)
+        graph[u].append((v, w))
+        nx_graph.add_edge(u, v, weight=w)
+    expected = nx.single_source_dijkstra_path_length(nx_graph, 0, weight="weight")
+    assert algo(graph, 0) == expected
+
+
+def test_band_sssp_negative_weight():
+    graph = {"A": [("B", -1)]}
+    with pytest.raises(ValueError):
+        band_sssp(graph, "A")
+
+
+def test_process_pivots_heapq_queue():
+    G, mapping = _fractional_graph(40, seed=2)
+    dist = [INF] * G.n
+    dist[0] = 0.0
+    process_pivots(G, dist, [0], INF)
+    _assert_matches_dijkstra(dist, mapping, G.n)
+
+
+def test_cleanup_heapq_queue():
+    # A band above the loop's 1e18 cutoff ends the loop after one pass of
+    # k rounds, leaving the 40-vertex chain for the final Dijkstra cleanup.
+    G, mapping = _fractional_graph(40, seed=4)
+    dist = band_partitioned_sssp(G, 0, initial_band=1e19)
+    _assert_matches_dijkstra(dist, mapping, G.n)
+
+
+@pytest.mark.parametrize(
+    "w, typecode",
+    [(2**23 - 1, "f"), (2**23, "d"), (0.5, "d")],
+)
+def test_graph_typecode(w, typecode):
+    # Two vertices: float32 is used only while 2 * w < 2**24.
+    G = Graph(2, [(0, 1, w)])
+    assert G.typecode == typecode
+    assert G.weight.typecode == typecode
+    assert list(band_partitioned_sssp(G, 0)) == [0.0, w]
+
+
+@pytest.fixture
+def batch_rounds(monkeypatch):
+    """Force process_pivots onto its batch path and record relax_rounds limits."""
+
+    monkeypatch.setattr(band, "BATCH_PIVOT_MIN", 1)
+    monkeypatch.setattr(band, "BATCH_PIVOT_FRACTION", 0.0)
+    calls = []
+    relax_rounds = band.relax_rounds
+
+    def spy(G, dist, work, rounds, *args):
+        calls.append(rounds)
+        return relax_rounds(G, dist, work, rounds, *args)
+
+    monkeypatch.setattr(band, "relax_rounds", spy)
+    return calls
+
+
+def test_process_pivots_batch_rounds(batch_rounds):
+    G, mapping = _fractional_graph(40, seed=6)
+    dist = [INF] * G.n
+    dist[0] = 0.0
+    process_pivots(G, dist, [0], INF)
+    assert batch_rounds == [None]
+    _assert_matches_dijkstra(dist, mapping, G.n)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_band_sssp_batch_pivots(batch_rounds, seed):
+    random.seed(seed)
+    n = 60
+    g = nx.gnp_random_graph(n, 0.1, directed=True, seed=seed)
+    graph = defaultdict(list)
+    for u, v in g.edges():
+        graph[u].append((v, random.randint(0, 20)))
+    assert band_sssp(graph, 0) == dijkstra(graph, 0)
+    assert None in batch_rounds
+
+
+def test_band_loop_stops_at_fixed_point(monkeypatch):
+    bands = []
+    k_round_relax = band.k_round_relax
+
+    def spy(G, dist, active, k, band_upper, *args):
+        bands.append(band_upper)
+        return k_round_relax(G, dist, active, k, band_upper, *args)
+
+    monkeypatch.setattr(band, "k_round_relax", spy)
+    G = Graph(4, [(0, 1, 1), (1, 2, 1), (2, 3, 1)])
+    assert list(band_partitioned_sssp(G, 0, initial_band=1.0)) == [0, 1, 2, 3]
+    # Band 8 is the first to cover max(dist) + max(weight) = 4; the loop
+    # must stop there rather than doubling on towards the 1e18 cutoff.
+    assert max(bands) == 8.0